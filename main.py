@@ -1,36 +1,54 @@
 import os
 import re
-import json
+import html
 import sqlite3
 import hashlib
+import threading
+import time
+from bisect import bisect_right
+from contextlib import contextmanager
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Optional, List, Dict, Any, Tuple
 
+import orjson
 import requests
-from bs4 import BeautifulSoup
-from fastapi import FastAPI
-from fastapi.responses import HTMLResponse, RedirectResponse
+from selectolax.lexbor import LexborHTMLParser
+from fastapi import BackgroundTasks, FastAPI
+from fastapi.responses import HTMLResponse, ORJSONResponse, RedirectResponse
 
 
-app = FastAPI(title="DealBite API", version="1.1")
+app = FastAPI(title="DealBite API", version="1.1", default_response_class=ORJSONResponse)
 
 DB_PATH = os.environ.get("DB_PATH", os.path.join(os.getcwd(), "dealbite.db"))
 
+# Shared HTTP session: keeps connections (and TLS sessions) alive across refreshes
+SESSION = requests.Session()
+SESSION.headers["User-Agent"] = "Mozilla/5.0"
+
 
 # ----------------------------
 # Helpers
 # ----------------------------
+_MONEY_RE = re.compile(r"\$\d+(?:\.\d{1,2})?")
+_SENT_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+_ORDER_NOW_RE = re.compile(r"^(Order Now\s*)+", re.I)
+_COVER_CRAVINGS_RE = re.compile(r"Cover All Cravings\s*", re.I)
+_TRIM_BOILERPLATE_RE = re.compile(r"\b(?:Within|Choice of|includes|customers|available|Each)\b")
+
+
 def now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
 def normalize(s: str) -> str:
-    return " ".join((s or "").split()).strip()
-
-
-def money_tokens(s: str) -> List[str]:
-    # Finds $4, $4.99, etc.
-    return re.findall(r"\$\d+(?:\.\d{1,2})?", s or "")
+    if not s:
+        return ""
+    # Fast path: already clean. isprintable() is False for every whitespace char except " ",
+    # so this only skips the split/join when it would be a no-op.
+    if s.isprintable() and "  " not in s and s[0] != " " and s[-1] != " ":
+        return s
+    return " ".join(s.split()).strip()
 
 
 def pick_price(tokens: List[str]) -> Optional[float]:
@@ -43,22 +61,48 @@ def pick_price(tokens: List[str]) -> Optional[float]:
     return min(nums) if nums else None
 
 
-def extract_price_phrases(text: str) -> List[str]:
-    # Pull sentences/phrases that contain a $ amount
-    matches = re.findall(r"[^.]*\$\d+(?:\.\d{1,2})?[^.]*", text)
-    cleaned = []
-    for m in matches:
-        m = normalize(m)
-        if 20 <= len(m) <= 220:
-            cleaned.append(m)
+def parse_price(token: str) -> Optional[float]:
+    try:
+        return float(str(token).replace("$", ""))
+    except Exception:
+        return None
+
+
+def extract_priced_phrases(text: str) -> List[Tuple[str, List[str]]]:
+    # Pull sentences that contain a $ amount, along with those amounts.
+    # One sweep finds sentence boundaries, one finds every $ amount; each amount is
+    # bucketed into its sentence by binary search over the sentence start offsets.
+    if "$" not in text:
+        return []
+
+    starts = [0]
+    ends = []
+    for m in _SENT_SPLIT_RE.finditer(text):
+        ends.append(m.start())
+        starts.append(m.end())
+    ends.append(len(text))
+
+    by_sentence: Dict[int, List[str]] = {}
+    for m in _MONEY_RE.finditer(text):
+        by_sentence.setdefault(bisect_right(starts, m.start()) - 1, []).append(m.group())
+
     # de-dupe preserve order
-    return list(dict.fromkeys(cleaned))
+    out: Dict[str, List[str]] = {}
+    for i, prices in by_sentence.items():
+        # normalize() never lengthens a string, so too-short sentences can be rejected up front
+        if ends[i] - starts[i] < 20:
+            continue
+        phrase = normalize(text[starts[i]:ends[i]])
+        if 20 <= len(phrase) <= 220 and phrase not in out:
+            out[phrase] = prices
+    return list(out.items())
 
 
+@lru_cache(maxsize=1024)
 def clean_wendys_title(text: str) -> str:
     t = normalize(text)
-    t = re.sub(r"^(Order Now\s*)+", "", t, flags=re.I)
-    t = re.sub(r"Cover All Cravings\s*", "", t, flags=re.I)
+    t = _ORDER_NOW_RE.sub("", t)
+    t = _COVER_CRAVINGS_RE.sub("", t)
 
     # Some Wendy's page copy has “?” then the actual headline
     if "?" in t:
@@ -71,22 +115,19 @@ def clean_wendys_title(text: str) -> str:
         return "Biggie Deals price points: $4 Biggie Bites, $6 Biggie Bag, $8 Biggie Bundle"
 
     # Trim after common boilerplate segments
-    t = re.split(r"\b(?:Within|Choice of|includes|customers|available|Each)\b", t, maxsplit=1)[0].strip()
+    t = _TRIM_BOILERPLATE_RE.split(t, maxsplit=1)[0].strip()
     t = t.strip(" -:;,.")
     if len(t) > 90:
         t = t[:90].rstrip(" -:;,.")
     return t
 
 
-def make_deal_id(deal: Dict[str, Any]) -> str:
-    # Stable across refreshes as long as these fields stay the same
-    canonical = "|".join([
-        str(deal.get("restaurant", "")).strip().lower(),
-        str(deal.get("market", "")).strip().lower(),
-        str(deal.get("title", "")).strip().lower(),
-        str(deal.get("source_url", "")).strip().lower(),
-    ])
-    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+@lru_cache(maxsize=1024)
+def _make_deal_id(restaurant: str, market: str, title: str, source_url: str) -> str:
+    # Stable across refreshes as long as these fields stay the same.
+    # Fields must already be stripped + lowercased (derive_fields does this).
+    canonical = "|".join((restaurant, market, title, source_url))
+    return hashlib.sha256(canonical.encode("utf-8")).digest()[:8].hex()
 
 
 def estimate_savings_from_prices(starting_price: Optional[float], all_prices: List[str]) -> Optional[float]:
@@ -137,71 +178,236 @@ def compute_value_score(starting_price: Optional[float], estimated_savings: Opti
 # ----------------------------
 # Database
 # ----------------------------
-def db_connect() -> sqlite3.Connection:
-    conn = sqlite3.connect(DB_PATH)
+# Page cache per connection, in KiB. The writer gets the big one; each per-thread reader
+# a small one, so total memory stays bounded however many threadpool threads read.
+WRITE_CACHE_KIB = 64000
+READ_CACHE_KIB = 2000
+
+
+def db_connect(cache_kib: int = READ_CACHE_KIB, check_same_thread: bool = True) -> sqlite3.Connection:
+    # Autocommit mode: transactions are opened explicitly around writes
+    conn = sqlite3.connect(DB_PATH, check_same_thread=check_same_thread, isolation_level=None)
     conn.row_factory = sqlite3.Row
+
+    # Per-connection settings: fewer fsyncs, temp tables in RAM, bounded page cache
+    conn.executescript(f"""
+        PRAGMA synchronous=NORMAL;
+        PRAGMA temp_store=MEMORY;
+        PRAGMA cache_size=-{int(cache_kib)};
+    """)
     return conn
 
 
+# One long-lived writer connection, serialized through WRITE_LOCK. Reads go through a
+# per-thread connection (read_conn) so WAL isolates them from the writer's open
+# transaction instead of letting them see its uncommitted rows.
+CONN = db_connect(cache_kib=WRITE_CACHE_KIB, check_same_thread=False)
+# WAL persists in the db file, so it's switched on once, here; 256 MiB mmap for the writer only
+CONN.executescript("""
+    PRAGMA journal_mode=WAL;
+    PRAGMA mmap_size=268435456;
+""")
+WRITE_LOCK = threading.Lock()
+
+_read_local = threading.local()
+
+
+def read_conn() -> sqlite3.Connection:
+    # Thread-local, so it never crosses threads and keeps sqlite3's same-thread check
+    conn = getattr(_read_local, "conn", None)
+    if conn is None:
+        conn = _read_local.conn = db_connect()
+    return conn
+
+
+@contextmanager
+def write_transaction():
+    with WRITE_LOCK:
+        CONN.execute("BEGIN IMMEDIATE")
+        try:
+            yield CONN
+        except Exception:
+            CONN.execute("ROLLBACK")
+            raise
+        else:
+            CONN.execute("COMMIT")
+        finally:
+            # Committed or rolled back, drop anything read while the write was in flight
+            clear_deals_cache()
+
+
 def ensure_db() -> None:
-    conn = db_connect()
-    cur = conn.cursor()
-    cur.execute("""
+    CONN.execute("""
         CREATE TABLE IF NOT EXISTS deals (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             restaurant TEXT NOT NULL,
             market TEXT NOT NULL,
             title TEXT NOT NULL,
             starting_price REAL,
-            all_prices TEXT,
             source_url TEXT,
             created_at TEXT NOT NULL,
+            deal_id TEXT,
+            estimated_savings REAL,
+            value_score REAL,
             UNIQUE(restaurant, market, title, source_url)
         )
     """)
-    conn.commit()
-    conn.close()
+    # One row per $ amount on a deal, in the order they appeared in the phrase
+    CONN.execute("""
+        CREATE TABLE IF NOT EXISTS prices (
+            deal_rowid INTEGER NOT NULL REFERENCES deals(id),
+            position INTEGER NOT NULL,
+            token TEXT NOT NULL,
+            price REAL,
+            PRIMARY KEY (deal_rowid, position)
+        ) WITHOUT ROWID
+    """)
+
+    # Older databases predate the stored intelligence fields and the prices table
+    cols = {r["name"] for r in CONN.execute("PRAGMA table_info(deals)")}
+    for name, decl in (("deal_id", "TEXT"), ("estimated_savings", "REAL"), ("value_score", "REAL")):
+        if name not in cols:
+            CONN.execute(f"ALTER TABLE deals ADD COLUMN {name} {decl}")
+    if "all_prices" in cols:
+        migrate_all_prices()
+    backfill_derived_fields()
+
+    # Serve fetch_deals' market / restaurant filters + ORDER BY id DESC from an index
+    CONN.execute("CREATE INDEX IF NOT EXISTS ix_deals_market_id ON deals(market, id DESC)")
+    CONN.execute("CREATE INDEX IF NOT EXISTS ix_deals_rest_lower ON deals(lower(restaurant), id DESC)")
+
+
+def migrate_all_prices() -> None:
+    # Move the legacy JSON all_prices column into the prices table (then blank it so this runs once)
+    rows = CONN.execute("SELECT id, all_prices FROM deals WHERE all_prices IS NOT NULL").fetchall()
+    if not rows:
+        return
+
+    price_rows = []
+    for r in rows:
+        # A malformed legacy value (e.g. '') just means no prices; it mustn't abort startup
+        try:
+            tokens = orjson.loads(r["all_prices"])
+        except orjson.JSONDecodeError:
+            tokens = []
+        if not isinstance(tokens, list):
+            tokens = []
+        for pos, token in enumerate(tokens):
+            price_rows.append((r["id"], pos, str(token), parse_price(token)))
+
+    with write_transaction():
+        CONN.executemany("INSERT OR IGNORE INTO prices (deal_rowid, position, token, price) VALUES (?, ?, ?, ?)", price_rows)
+        CONN.execute("UPDATE deals SET all_prices = NULL WHERE all_prices IS NOT NULL")
+
+
+def derive_fields(restaurant: str, market: str, title: str, source_url: Optional[str],
+                  starting_price: Optional[float], all_prices: List[str]) -> Tuple[str, Optional[float], float]:
+    """
+    (deal_id, estimated_savings, value_score) for a deal, computed once at write time
+    so reads never have to re-derive them.
+    """
+    # title is already normalize()d, so only needs lowercasing
+    deal_id = _make_deal_id(
+        str(restaurant).strip().lower(),
+        str(market).strip().lower(),
+        title.lower(),
+        str(source_url).strip().lower(),
+    )
+    estimated_savings = estimate_savings_from_prices(starting_price, all_prices)
+    return deal_id, estimated_savings, compute_value_score(starting_price, estimated_savings)
+
+
+def load_prices(conn: sqlite3.Connection, ids_sql: str, params: List[Any]) -> Dict[int, List[str]]:
+    """
+    Price tokens per deal row id for the deals selected by `ids_sql`, in position order.
+    The order comes from the outer ORDER BY (group_concat's order isn't guaranteed).
+    """
+    out: Dict[int, List[str]] = {}
+    q = f"SELECT deal_rowid, token FROM prices WHERE deal_rowid IN ({ids_sql}) ORDER BY deal_rowid, position"
+    for r in conn.execute(q, params):
+        out.setdefault(r["deal_rowid"], []).append(r["token"])
+    return out
+
+
+def backfill_derived_fields() -> None:
+    rows = CONN.execute("""
+        SELECT id, restaurant, market, title, starting_price, source_url
+        FROM deals WHERE deal_id IS NULL
+    """).fetchall()
+    if not rows:
+        return
+
+    prices = load_prices(CONN, "SELECT id FROM deals WHERE deal_id IS NULL", [])
+    updates = []
+    for r in rows:
+        all_prices = prices.get(r["id"], [])
+        fields = derive_fields(r["restaurant"], r["market"], r["title"], r["source_url"], r["starting_price"], all_prices)
+        updates.append(fields + (r["id"],))
+
+    with write_transaction():
+        CONN.executemany("UPDATE deals SET deal_id = ?, estimated_savings = ?, value_score = ? WHERE id = ?", updates)
 
 
 def upsert_deals(deals: List[Dict[str, Any]]) -> int:
-    ensure_db()
-    conn = db_connect()
-    cur = conn.cursor()
     created_at = now_iso()
-    added = 0
 
+    rows = []
+    # natural key -> price lists of the input rows with that key, in input order
+    prices_by_key: Dict[Tuple[Any, ...], List[List[str]]] = {}
     for d in deals:
         title = normalize(d.get("title", ""))
         if not title:
             continue
-
-        cur.execute("""
-            INSERT OR IGNORE INTO deals
-            (restaurant, market, title, starting_price, all_prices, source_url, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (
-            d.get("restaurant", ""),
-            d.get("market", ""),
+        restaurant = d.get("restaurant", "")
+        market = d.get("market", "")
+        starting_price = d.get("starting_price")
+        all_prices = d.get("all_prices", [])
+        source_url = d.get("source_url")
+        rows.append((
+            restaurant,
+            market,
             title,
-            d.get("starting_price"),
-            json.dumps(d.get("all_prices", [])),
-            d.get("source_url"),
-            created_at
+            starting_price,
+            source_url,
+            created_at,
+            *derive_fields(restaurant, market, title, source_url, starting_price, all_prices),
         ))
-        if cur.rowcount == 1:
-            added += 1
+        prices_by_key.setdefault((restaurant, market, title, source_url), []).append(all_prices)
+
+    # One executemany + one transaction for the whole batch. Prices are attached only to
+    # rows this call inserted (ids above the pre-insert MAX(id); AUTOINCREMENT never reuses
+    # ids), so an ignored duplicate can't add its prices to the existing deal.
+    price_rows = []
+    with write_transaction():
+        max_id = CONN.execute("SELECT COALESCE(MAX(id), 0) FROM deals").fetchone()[0]
+        CONN.executemany("""
+            INSERT OR IGNORE INTO deals
+            (restaurant, market, title, starting_price, source_url, created_at,
+             deal_id, estimated_savings, value_score)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows)
 
-    conn.commit()
-    conn.close()
-    return added
+        new_rows = CONN.execute(
+            "SELECT id, restaurant, market, title, source_url FROM deals WHERE id > ? ORDER BY id", (max_id,)
+        ).fetchall()
+        for r in new_rows:
+            # Rows were inserted in input order, so the first pending list for a key is this row's
+            all_prices = prices_by_key[(r["restaurant"], r["market"], r["title"], r["source_url"])].pop(0)
+            for pos, token in enumerate(all_prices):
+                price_rows.append((r["id"], pos, str(token), parse_price(token)))
 
+        CONN.executemany("INSERT INTO prices (deal_rowid, position, token, price) VALUES (?, ?, ?, ?)", price_rows)
+
+    return len(new_rows)
 
-def fetch_deals(market: Optional[str] = None, restaurant: Optional[str] = None, limit: int = 200) -> List[Dict[str, Any]]:
-    ensure_db()
-    conn = db_connect()
-    cur = conn.cursor()
 
-    q = "SELECT restaurant, market, title, starting_price, all_prices, source_url, created_at FROM deals"
+_DEAL_COLUMNS = """
+    id, deal_id, restaurant, market, title, starting_price, source_url, created_at,
+    estimated_savings, value_score
+"""
+
+
+def _deal_filters(market: Optional[str], restaurant: Optional[str]) -> Tuple[str, List[Any]]:
     params = []
     where = []
 
@@ -213,37 +419,109 @@ def fetch_deals(market: Optional[str] = None, restaurant: Optional[str] = None,
         where.append("LOWER(restaurant) = ?")
         params.append(restaurant.lower())
 
-    if where:
-        q += " WHERE " + " AND ".join(where)
+    if not where:
+        return "", params
+    return " WHERE " + " AND ".join(where), params
+
+
+def _rows_to_deals(conn: sqlite3.Connection, rows: List[sqlite3.Row]) -> List[Dict[str, Any]]:
+    if not rows:
+        return []
+    ids = [r["id"] for r in rows]
+    prices = load_prices(conn, ",".join("?" * len(ids)), ids)
+    return [_row_to_deal(r, prices.get(r["id"], [])) for r in rows]
+
+
+def _row_to_deal(r: sqlite3.Row, all_prices: List[str]) -> Dict[str, Any]:
+    return {
+        "restaurant": r["restaurant"],
+        "market": r["market"],
+        "title": r["title"],
+        "starting_price": r["starting_price"],
+        "all_prices": all_prices,
+        "source_url": r["source_url"],
+        "created_at": r["created_at"],
+        # intelligence fields (stored at insert time)
+        "id": r["deal_id"],
+        "estimated_savings": r["estimated_savings"],
+        "value_score": r["value_score"],
+    }
+
+
+# ----------------------------
+# Read cache
+# ----------------------------
+# Deals only change on refresh, so reads are served from a small TTL cache that
+# write_transaction clears whenever a write finishes (commit or rollback).
+DEALS_CACHE_TTL = 60.0
+DEALS_CACHE_MAX = 64
+
+_deals_cache: Dict[Tuple[Any, ...], Tuple[float, Any]] = {}
+_deals_cache_gen = 0
+_deals_cache_lock = threading.Lock()
+
+
+def clear_deals_cache() -> None:
+    global _deals_cache_gen
+    with _deals_cache_lock:
+        _deals_cache.clear()
+        _deals_cache_gen += 1
+
 
-    q += " ORDER BY id DESC LIMIT ?"
+def _cached(key: Tuple[Any, ...], load):
+    now = time.monotonic()
+    with _deals_cache_lock:
+        hit = _deals_cache.get(key)
+        if hit and hit[0] > now:
+            return hit[1]
+        gen = _deals_cache_gen
+
+    value = load()
+
+    with _deals_cache_lock:
+        # Don't store a result loaded before a concurrent write cleared the cache
+        if gen == _deals_cache_gen:
+            if key not in _deals_cache and len(_deals_cache) >= DEALS_CACHE_MAX:
+                _deals_cache.pop(next(iter(_deals_cache)))
+            _deals_cache[key] = (now + DEALS_CACHE_TTL, value)
+    return value
+
+
+def fetch_deals(market: Optional[str] = None, restaurant: Optional[str] = None, limit: int = 200) -> List[Dict[str, Any]]:
+    return _cached(("deals", market, restaurant, limit), lambda: _query_deals(market, restaurant, limit))
+
+
+def fetch_best_deal(market: Optional[str] = None, restaurant: Optional[str] = None, limit: int = 200) -> Optional[Dict[str, Any]]:
+    return _cached(("best", market, restaurant, limit), lambda: _query_best_deal(market, restaurant, limit))
+
+
+def _query_deals(market: Optional[str], restaurant: Optional[str], limit: int) -> List[Dict[str, Any]]:
+    where, params = _deal_filters(market, restaurant)
+    q = f"SELECT {_DEAL_COLUMNS} FROM deals{where} ORDER BY id DESC LIMIT ?"
     params.append(limit)
 
-    cur.execute(q, params)
-    rows = cur.fetchall()
-    conn.close()
+    conn = read_conn()
+    return _rows_to_deals(conn, conn.execute(q, params).fetchall())
 
-    out = []
-    for r in rows:
-        all_prices = json.loads(r["all_prices"]) if r["all_prices"] else []
-        deal = {
-            "restaurant": r["restaurant"],
-            "market": r["market"],
-            "title": r["title"],
-            "starting_price": r["starting_price"],
-            "all_prices": all_prices,
-            "source_url": r["source_url"],
-            "created_at": r["created_at"],
-        }
-
-        # add intelligence fields
-        deal["id"] = make_deal_id(deal)
-        deal["estimated_savings"] = estimate_savings_from_prices(deal["starting_price"], deal["all_prices"])
-        deal["value_score"] = compute_value_score(deal["starting_price"], deal["estimated_savings"])
-
-        out.append(deal)
 
-    return out
+def _query_best_deal(market: Optional[str], restaurant: Optional[str], limit: int) -> Optional[Dict[str, Any]]:
+    # Rank within the same latest-`limit` window fetch_deals returns
+    where, params = _deal_filters(market, restaurant)
+    q = f"""
+        SELECT {_DEAL_COLUMNS} FROM deals
+        WHERE id IN (SELECT id FROM deals{where} ORDER BY id DESC LIMIT ?)
+        ORDER BY value_score DESC, estimated_savings DESC, id DESC LIMIT 1
+    """
+    params.append(limit)
+
+    conn = read_conn()
+    deals = _rows_to_deals(conn, conn.execute(q, params).fetchall())
+    return deals[0] if deals else None
+
+
+# Create / migrate the schema once at import so every entry point (the app, TestClient,
+# scripts calling fetch_deals directly) finds the tables in place
+ensure_db()
 
 
 # ----------------------------
@@ -251,15 +529,16 @@ def fetch_deals(market: Optional[str] = None, restaurant: Optional[str] = None,
 # ----------------------------
 def refresh_wendys_scrape(market: str = "cleveland-oh") -> List[Dict[str, Any]]:
     url = "https://www.wendys.com/mealdeals"
-    r = requests.get(url, headers={"User-Agent": "Mozilla/5.0"}, timeout=25)
+    r = SESSION.get(url, timeout=25)
     r.raise_for_status()
 
-    text = normalize(BeautifulSoup(r.text, "lxml").get_text(" "))
-    phrases = extract_price_phrases(text)
-
+    # Hand Lexbor the raw bytes; r.text would decode (and copy) the whole page first
+    parser = LexborHTMLParser(r.content)
+    # Like bs4's get_text(), leave out non-visible text (inline JS/JSON can carry $ amounts)
+    parser.strip_tags(["script", "style", "noscript", "template"])
+    text = normalize(parser.body.text(separator=" "))
     deals = []
-    for ph in phrases:
-        prices = money_tokens(ph)
+    for ph, prices in extract_priced_phrases(text):
         title = clean_wendys_title(ph)
         if not title:
             continue
@@ -294,13 +573,10 @@ def get_deals_api(market: Optional[str] = None, restaurant: Optional[str] = None
 
 @app.get("/best")
 def best_deal_api(market: Optional[str] = None, restaurant: Optional[str] = None):
-    deals = fetch_deals(market=market, restaurant=restaurant)
-    if not deals:
+    best = fetch_best_deal(market=market, restaurant=restaurant)
+    if not best:
         return {"best": None, "reason": "No deals available yet."}
 
-    deals_sorted = sorted(deals, key=lambda d: (d.get("value_score", 0), -(d.get("estimated_savings") or 0)), reverse=True)
-    best = deals_sorted[0]
-
     reason_parts = []
     if best.get("estimated_savings") is not None:
         reason_parts.append(f"highest value signal (range ≈ ${best['estimated_savings']})")
@@ -315,40 +591,46 @@ def best_deal_api(market: Optional[str] = None, restaurant: Optional[str] = None
     }
 
 
+def run_wendys_refresh(market: str = "cleveland-oh") -> int:
+    deals = refresh_wendys_scrape(market=market)
+    return upsert_deals(deals)
+
+
 @app.post("/refresh/wendys")
-def refresh_wendys():
-    deals = refresh_wendys_scrape(market="cleveland-oh")
-    added = upsert_deals(deals)
-    # Redirect back to dashboard so you can see results immediately
+def refresh_wendys(background_tasks: BackgroundTasks):
+    # Scrape + write after the response is sent; the dashboard picks up new deals on reload
+    background_tasks.add_task(run_wendys_refresh, market="cleveland-oh")
     return RedirectResponse(url="/", status_code=303)
 
 
 @app.get("/", response_class=HTMLResponse)
 def dashboard():
     cle = fetch_deals(market="cleveland-oh")
-    best = None
-    if cle:
-        best = sorted(cle, key=lambda d: d.get("value_score", 0), reverse=True)[0]
+    best = fetch_best_deal(market="cleveland-oh")
 
     def table(rows: List[Dict[str, Any]], title: str) -> str:
         if not rows:
             return f"<h2>{title}</h2><p>No deals yet.</p>"
-        html = f"<h2>{title}</h2><table border='1' cellpadding='6' cellspacing='0'>"
-        html += "<tr><th>Restaurant</th><th>Title</th><th>Start $</th><th>Score</th><th>Est. Savings</th><th>Source</th></tr>"
+        parts = [
+            f"<h2>{title}</h2><table border='1' cellpadding='6' cellspacing='0'>",
+            "<tr><th>Restaurant</th><th>Title</th><th>Start $</th><th>Score</th><th>Est. Savings</th><th>Source</th></tr>",
+        ]
         for d in rows[:50]:
             price = "" if d["starting_price"] is None else d["starting_price"]
             score = d.get("value_score", "")
             sav = "" if d.get("estimated_savings") is None else d["estimated_savings"]
-            html += "<tr>"
-            html += f"<td>{d['restaurant']}</td>"
-            html += f"<td>{d['title']}</td>"
-            html += f"<td>{price}</td>"
-            html += f"<td>{score}</td>"
-            html += f"<td>{sav}</td>"
-            html += f'<td><a href="{d["source_url"]}" target="_blank">link</a></td>'
-            html += "</tr>"
-        html += "</table>"
-        return html
+            parts.append(
+                "<tr>"
+                f"<td>{html.escape(d['restaurant'])}</td>"
+                f"<td>{html.escape(d['title'])}</td>"
+                f"<td>{price}</td>"
+                f"<td>{score}</td>"
+                f"<td>{sav}</td>"
+                f'<td><a href="{html.escape(d["source_url"] or "")}" target="_blank">link</a></td>'
+                "</tr>"
+            )
+        parts.append("</table>")
+        return "".join(parts)
 
     page = "<h1>DealBite Dashboard</h1>"
     page += f"<p><b>DB:</b> {DB_PATH}</p>"
@@ -361,7 +643,7 @@ def dashboard():
 
     if best:
         page += "<h2>Best Deal (Cleveland)</h2>"
-        page += f"<p><b>{best['restaurant']}</b> — {best['title']}<br/>"
+        page += f"<p><b>{html.escape(best['restaurant'])}</b> — {html.escape(best['title'])}<br/>"
         page += f"Start: {best.get('starting_price')} | Score: {best.get('value_score')} | Est. Savings: {best.get('estimated_savings')}</p>"
         page += "<hr/>"
 
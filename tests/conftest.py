@@ -0,0 +1,22 @@
+import importlib
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def load_main(monkeypatch):
+    """
+    Import main against a given DB file. main opens its connection and runs
+    ensure_db() at import, so each test gets a fresh module.
+    """
+    def _load(db_path):
+        monkeypatch.setenv("DB_PATH", str(db_path))
+        sys.modules.pop("main", None)
+        return importlib.import_module("main")
+
+    yield _load
+    sys.modules.pop("main", None)
@@ -0,0 +1,108 @@
+import hashlib
+import json
+import sqlite3
+
+# deals table as created by the baseline release (prices stored as a JSON column)
+BASELINE_SCHEMA = """
+    CREATE TABLE deals (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        restaurant TEXT NOT NULL,
+        market TEXT NOT NULL,
+        title TEXT NOT NULL,
+        starting_price REAL,
+        all_prices TEXT,
+        source_url TEXT,
+        created_at TEXT NOT NULL,
+        UNIQUE(restaurant, market, title, source_url)
+    )
+"""
+
+
+def baseline_deal_id(restaurant, market, title, source_url):
+    # make_deal_id as it shipped in the baseline release
+    canonical = "|".join([
+        str(restaurant).strip().lower(),
+        str(market).strip().lower(),
+        str(title).strip().lower(),
+        str(source_url).strip().lower(),
+    ])
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def test_migrates_baseline_database(tmp_path, load_main):
+    db_path = tmp_path / "dealbite.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute(BASELINE_SCHEMA)
+    conn.executemany(
+        "INSERT INTO deals (restaurant, market, title, starting_price, all_prices, source_url, created_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [
+            ("Wendy's", "cleveland-oh", "Biggie Bag", 4.0, json.dumps(["$4", "$6", "$8"]), "https://x", "t"),
+            ("Wendy's", "cleveland-oh", "Broken prices", 3.0, "", "https://x", "t"),
+            ("Wendy's", "cleveland-oh", "No url", None, json.dumps(["$5"]), None, "t"),
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+    main = load_main(db_path)
+
+    prices = main.CONN.execute(
+        "SELECT deal_rowid, position, token, price FROM prices ORDER BY deal_rowid, position"
+    ).fetchall()
+    assert [tuple(r) for r in prices] == [
+        (1, 0, "$4", 4.0),
+        (1, 1, "$6", 6.0),
+        (1, 2, "$8", 8.0),
+        (3, 0, "$5", 5.0),
+    ]
+    # Legacy column is emptied so the migration only runs once
+    assert main.CONN.execute("SELECT COUNT(*) FROM deals WHERE all_prices IS NOT NULL").fetchone()[0] == 0
+
+    rows = main.CONN.execute("SELECT id, deal_id, estimated_savings FROM deals ORDER BY id").fetchall()
+    assert [r["deal_id"] for r in rows] == [
+        baseline_deal_id("Wendy's", "cleveland-oh", "Biggie Bag", "https://x"),
+        baseline_deal_id("Wendy's", "cleveland-oh", "Broken prices", "https://x"),
+        baseline_deal_id("Wendy's", "cleveland-oh", "No url", None),
+    ]
+    assert [r["estimated_savings"] for r in rows] == [4.0, None, None]
+
+    deals = {d["title"]: d for d in main.fetch_deals(market="cleveland-oh")}
+    assert deals["Biggie Bag"]["all_prices"] == ["$4", "$6", "$8"]
+    assert deals["Broken prices"]["all_prices"] == []
+
+    # Re-running ensure_db on an already migrated DB is a no-op
+    main.ensure_db()
+    assert main.CONN.execute("SELECT COUNT(*) FROM prices").fetchone()[0] == 4
+
+
+def test_upsert_keeps_prices_on_inserted_deal(tmp_path, load_main):
+    main = load_main(tmp_path / "dealbite.db")
+    deal = {"restaurant": "Wendy's", "market": "m", "title": "Biggie", "source_url": "u"}
+
+    added = main.upsert_deals([
+        dict(deal, starting_price=4.0, all_prices=["$4", "$6", "$8"]),
+        dict(deal, starting_price=1.0, all_prices=["$1", "$6", "$8", "$10", "$12"]),
+    ])
+    assert added == 1
+    assert main.upsert_deals([dict(deal, starting_price=1.0, all_prices=["$1", "$6", "$8", "$10", "$12"])]) == 0
+
+    [stored] = main.fetch_deals(market="m")
+    assert stored["all_prices"] == ["$4", "$6", "$8"]
+    assert stored["estimated_savings"] == 4.0
+
+
+def test_extract_priced_phrases_buckets_prices_by_sentence(tmp_path, load_main):
+    main = load_main(tmp_path / "dealbite.db")
+    text = (
+        "Get the Biggie Bag for $6.99 or the bundle for $8 today. "
+        "Hours vary by location. "
+        "Try $4 Biggie Bites with nuggets! "
+        "Short $5. "
+        "Get the Biggie Bag for $6.99 or the bundle for $8 today."
+    )
+    assert main.extract_priced_phrases(text) == [
+        ("Get the Biggie Bag for $6.99 or the bundle for $8 today.", ["$6.99", "$8"]),
+        ("Try $4 Biggie Bites with nuggets!", ["$4"]),
+    ]
+    assert main.extract_priced_phrases("No prices on this page at all.") == []